@@ -1,20 +1,225 @@
+import csv
+import io
 import json
 import os
 import pyttsx3
+import queue
+import select
+import sys
+import tempfile
+import threading
 import time
+import wave
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache, partial
 from typing import Dict, List
 
+# Optional backends for playing cached WAV audio
+try:
+    import winsound
+except ImportError:
+    winsound = None
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None
+
+WAV_PLAYBACK = winsound is not None or simpleaudio is not None
+# Errors from rendering or playing a cached phrase, after which the engine speaks instead
+AUDIO_ERRORS = (OSError, RuntimeError, EOFError, wave.Error)
+if simpleaudio is not None and hasattr(simpleaudio, 'SimpleaudioError'):
+    AUDIO_ERRORS += (simpleaudio.SimpleaudioError,)
+
+# Single-key responses need a POSIX terminal; elsewhere responses are read with input()
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+
+# orjson is much faster for large attendance files; fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Set ATTENDANCE_DEBUG to write an indented, human-readable data file
+DEBUG = bool(os.environ.get('ATTENDANCE_DEBUG'))
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """Serialize obj to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(',', ':')).encode()
+
+
+def _loads(data: bytes):
+    """Parse JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class AttendanceRecords(OrderedDict):
+    """Per-date attendance records kept in a bounded LRU cache over one JSON file per date.
+    
+    Only [], in, get(), setdefault() and assignment see dates stored on disk. len(),
+    iteration, keys()/items()/values() and pop() cover just the dates currently in memory.
+    Changes made in place to a date's dict are not tracked; assign it back or call write().
+    """
+    
+    def __init__(self, records_dir: str, maxsize: int = 30):
+        super().__init__()
+        self.records_dir = records_dir
+        self.maxsize = maxsize
+        # Dates whose in-memory records have changes not yet written to disk
+        self.dirty = set()
+    
+    def _path(self, date: str):
+        """Path of the file holding attendance for a date"""
+        return os.path.join(self.records_dir, f"{date}.json")
+    
+    def __getitem__(self, date: str):
+        if super().__contains__(date):
+            self.move_to_end(date)
+            return super().__getitem__(date)
+        
+        try:
+            with open(self._path(date), 'rb') as f:
+                records = _loads(f.read())
+        except FileNotFoundError:
+            raise KeyError(date) from None
+        self._keep(date, records)
+        return records
+    
+    def __setitem__(self, date: str, records: Dict):
+        self.dirty.add(date)
+        self._keep(date, records)
+    
+    def __contains__(self, date):
+        return super().__contains__(date) or os.path.exists(self._path(date))
+    
+    def get(self, date: str, default=None):
+        try:
+            return self[date]
+        except KeyError:
+            return default
+    
+    def setdefault(self, date: str, default: Dict = None):
+        records = self.get(date)
+        if records is None:
+            records = {} if default is None else default
+            self[date] = records
+        return records
+    
+    def _keep(self, date: str, records: Dict):
+        """Cache records for a date, evicting the least recently used dates past maxsize"""
+        super().__setitem__(date, records)
+        self.move_to_end(date)
+        while len(self) > self.maxsize:
+            old_date = next(iter(self))
+            old_records = super().__getitem__(old_date)
+            super().__delitem__(old_date)
+            if old_date in self.dirty:
+                self.write(old_date, old_records)
+    
+    def write(self, date: str, records: Dict = None):
+        """Write a date's records to its file, defaulting to the cached ones"""
+        if records is None:
+            records = super().__getitem__(date)
+        os.makedirs(self.records_dir, exist_ok=True)
+        with open(self._path(date), 'wb') as f:
+            f.write(_dumps(records, indent=DEBUG))
+        self.dirty.discard(date)
+    
+    def flush(self):
+        """Write every changed date to disk"""
+        for date in list(self.dirty):
+            self.write(date)
+
+
 class VoiceAttendanceSystem:
+    # Both cases are listed so responses can be looked up without lowercasing them
+    _STATUS_MAP = {'p': 'Present', 'a': 'Absent', 'l': 'Late',
+                   'P': 'Present', 'A': 'Absent', 'L': 'Late'}
+    _REPEAT_KEYS = {'r', 'R'}
+    _DATE_FMT = '%Y-%m-%d'
+    _TIME_FMT = '%H:%M:%S'
+    _DATETIME_FMT = f'{_DATE_FMT} {_TIME_FMT}'
+    # Longest a roll call waits for speech before moving on, in case the engine stalls
+    _SPEECH_TIMEOUT = 10
+    # Most dates whose report data is kept in memory at once
+    _SUMMARY_CACHE_SIZE = 32
+    
     def __init__(self, data_file='attendance_data.json'):
         self.data_file = data_file
+        self.journal_file = data_file + '.jsonl'
+        # Attendance is stored as one file per date and loaded only when needed
+        self.records_dir = os.path.join(os.path.dirname(data_file), 'records')
         self.students = {}
-        self.attendance_records = {}
-        
-        # Initialize text-to-speech engine
-        self.tts_engine = pyttsx3.init()
-        self.setup_voice()
+        self.attendance_records = AttendanceRecords(self.records_dir)
+        # Per-date report data in least recently used order, dropped whenever that date's records change
+        self._summary_cache = OrderedDict()
+        
+        # The text-to-speech engine is created on first use; see the tts_engine property
+        self._tts_engine = None
+        self._tts_lock = threading.RLock()
+        # Why the engine could not be created, if it failed; speech then falls back to print-only
+        self._tts_error = None
+        # Only speak aloud in an interactive session; NO_TTS or redirected output prints instead
+        self.tts_enabled = sys.stdout.isatty() and not os.environ.get('NO_TTS')
+        
+        # Utterances are spoken by a background worker so callers don't block
+        self._tts_q = queue.Queue()
+        # Rendered WAV audio for templated phrases (names, fixed prefixes/suffixes) only
+        self._wav_cache: Dict[str, bytes] = {}
+        self._speaking = False
+        self._playback = None
+        # Set by stop_speaking(); the worker acts on it so only it touches the engine
+        self._stop_requested = threading.Event()
+        self._tts_shutdown = threading.Event()
+        # Set whenever the worker has finished everything queued; guarded by _tts_idle_lock
+        self._tts_idle = threading.Event()
+        self._tts_idle.set()
+        self._tts_idle_lock = threading.Lock()
+        self._tts_thread = threading.Thread(target=self._tts_worker, daemon=True)
+        self._tts_thread.start()
+        
+        # Load the driver on the TTS worker while the data loads here, since both are slow
+        if self.tts_enabled:
+            self._enqueue(self._init_engine)
         self.load_data()
+        
+        # Changes are appended here and folded into data_file by save_data()
+        self._journal = open(self.journal_file, 'ab')
+    
+    @property
+    def tts_engine(self):
+        """The pyttsx3 engine, initialized and configured on first access"""
+        with self._tts_lock:
+            if self._tts_engine is None:
+                if self._tts_error is not None:
+                    raise self._tts_error
+                try:
+                    self._tts_engine = pyttsx3.init()
+                    self.setup_voice()
+                except Exception as e:
+                    self._tts_engine = None
+                    self._tts_error = e
+                    self.tts_enabled = False
+                    raise
+            return self._tts_engine
+    
+    def _init_engine(self):
+        """Create the engine ahead of first use, reporting a missing driver (TTS worker only)"""
+        try:
+            self.tts_engine
+        except Exception as e:
+            print(f"⚠️ Text-to-speech unavailable ({e}); announcements will only be printed")
     
     def setup_voice(self):
         """Configure the text-to-speech engine"""
@@ -30,50 +235,351 @@ class VoiceAttendanceSystem:
         self.tts_engine.setProperty('rate', 150)  # Speed of speech
         self.tts_engine.setProperty('volume', 0.9)  # Volume level (0.0 to 1.0)
     
-    def speak(self, text):
-        """Convert text to speech"""
+    def _tts_worker(self):
+        """Run queued speech jobs one after another"""
+        while not self._tts_shutdown.is_set():
+            job = self._tts_q.get()
+            try:
+                # Drop speech queued before the engine turned out to be unavailable
+                if self.tts_enabled:
+                    job()
+            except Exception as e:
+                # Keep the worker alive so later speech and speak_sync() still complete;
+                # a failure that turned speech off has already been reported
+                if self.tts_enabled:
+                    print(f"⚠️ Speech error: {e}")
+            finally:
+                with self._tts_idle_lock:
+                    self._tts_q.task_done()
+                    if self._tts_q.unfinished_tasks == 0:
+                        self._tts_idle.set()
+    
+    def _enqueue(self, job):
+        """Hand a speech job to the TTS worker"""
+        with self._tts_idle_lock:
+            self._tts_q.put(job)
+            self._tts_idle.clear()
+    
+    def _run_engine(self):
+        """Run the engine until its queued commands finish (TTS worker only)"""
+        try:
+            # runAndWait() works with every driver; only the worker blocks on it
+            self.tts_engine.runAndWait()
+        except Exception as e:
+            # A driver that cannot run its loop fails every time, so stop trying to speak
+            with self._tts_lock:
+                self._tts_error = e
+                self.tts_enabled = False
+            print(f"⚠️ Text-to-speech unavailable ({e}); announcements will only be printed")
+            raise
+    
+    def _stop_if_requested(self, name, location, length):
+        """Word callback that stops the engine once stop_speaking() asks (TTS worker only)"""
+        if self._stop_requested.is_set():
+            self._stop_requested.clear()
+            self._tts_engine.stop()
+    
+    def shutdown(self):
+        """Stop the TTS worker and close the journal"""
+        self._tts_shutdown.set()
+        self._tts_q.put(lambda: None)  # Wake the worker if it is waiting for a job
+        self._tts_thread.join()
+        self._journal.close()
+    
+    def _say(self, text):
+        """Speak text on the engine (TTS worker only)"""
+        self._stop_requested.clear()
+        self._speaking = True
+        engine = self.tts_engine
+        # Callbacks run on this thread inside runAndWait(), so the engine is stopped here too
+        token = engine.connect('started-word', self._stop_if_requested)
+        try:
+            engine.say(text)
+            self._run_engine()
+        finally:
+            engine.disconnect(token)
+            self._speaking = False
+    
+    def _render(self, text) -> bytes:
+        """Synthesize text into WAV bytes (TTS worker only)"""
+        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
+            wav_path = tmp.name
+        try:
+            self.tts_engine.save_to_file(text, wav_path)
+            self._run_engine()
+            with open(wav_path, 'rb') as f:
+                return f.read()
+        finally:
+            os.remove(wav_path)
+    
+    def _cached_wav(self, text) -> bytes:
+        """Return the WAV bytes for text, rendering them the first time (TTS worker only)"""
+        wav = self._wav_cache.get(text)
+        if wav is None:
+            wav = self._wav_cache[text] = self._render(text)
+        return wav
+    
+    def _play_wav(self, wav: bytes):
+        """Play WAV bytes and wait for them to finish (TTS worker only)"""
+        if winsound is not None:
+            winsound.PlaySound(wav, winsound.SND_MEMORY)
+            return
+        with wave.open(io.BytesIO(wav)) as wav_file:
+            self._playback = simpleaudio.WaveObject.from_wave_read(wav_file).play()
+        try:
+            self._playback.wait_done()
+        finally:
+            self._playback = None
+    
+    def _speak_parts(self, parts):
+        """Play each phrase from the audio cache, stopping early if interrupted (TTS worker only)"""
+        self._stop_requested.clear()
+        self._speaking = True
+        try:
+            for index, part in enumerate(parts):
+                if self._stop_requested.is_set():
+                    return
+                try:
+                    self._play_wav(self._cached_wav(part))
+                except AUDIO_ERRORS:
+                    # Speak only what has not been played yet, unless the engine itself failed
+                    if self.tts_enabled:
+                        self._say(' '.join(parts[index:]))
+                    return
+        finally:
+            self._speaking = False
+    
+    def _prerender(self, text):
+        """Queue text to be rendered into the audio cache while the engine is otherwise idle"""
+        if self.tts_enabled and WAV_PLAYBACK:
+            self._enqueue(partial(self._cached_wav, text))
+    
+    def speak(self, text, parts: tuple = None):
+        """Queue text to be spoken without waiting; parts splits it into separately cached phrases"""
         print(f"🔊 Speaking: {text}")
-        self.tts_engine.say(text)
-        self.tts_engine.runAndWait()
+        if not self.tts_enabled:
+            return
+        # One-off text is cheaper to say directly than to render, cache and replay
+        if parts and WAV_PLAYBACK:
+            self._enqueue(partial(self._speak_parts, parts))
+        else:
+            self._enqueue(partial(self._say, text))
+    
+    def speak_sync(self, text, parts: tuple = None):
+        """Convert text to speech and wait until everything queued has been spoken"""
+        self.speak(text, parts)
+        self._wait_for_speech()
+    
+    def _wait_for_speech(self, timeout: float = None) -> bool:
+        """Wait until everything queued has been spoken, returning False if the worker stopped or timeout passed"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Poll rather than join() so a stopped worker cannot block the caller forever
+        while not self._tts_idle.wait(timeout=0.1):
+            if not self._tts_thread.is_alive():
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+        return True
+    
+    def stop_speaking(self):
+        """Cut off the utterance currently being spoken, if any"""
+        playback = self._playback
+        if self._speaking or playback is not None:
+            # The TTS worker stops the engine and skips remaining phrases on seeing this
+            self._stop_requested.set()
+        if playback is not None:
+            # simpleaudio playback can be stopped from any thread
+            playback.stop()
+    
+    def read_key(self, prompt):
+        """Read a single-key response, interrupting speech as soon as a key is pressed"""
+        if termios is None or not sys.stdin.isatty():
+            response = input(prompt)[:1]
+            self.stop_speaking()
+            return response
+        
+        print(prompt, end='', flush=True)
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            # cbreak mode delivers each keypress immediately, without waiting for Enter;
+            # TCSANOW keeps keys typed before the prompt instead of flushing them
+            tty.setcbreak(fd, termios.TCSANOW)
+            # Skip Enter and other whitespace, e.g. from users used to typing "p" then Enter
+            key = self._read_keypress(fd)
+            while key.isspace():
+                key = self._read_keypress(fd)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        
+        self.stop_speaking()
+        # Don't echo escape sequences, which would move the cursor
+        print(key if key.isprintable() else '')
+        return key
+    
+    @staticmethod
+    def _read_keypress(fd) -> str:
+        """Read one keypress from a cbreak-mode terminal, keeping multi-byte keys together"""
+        data = os.read(fd, 1)
+        if data == b'\x1b':
+            # Arrow and function keys send ESC [ or ESC O followed by bytes up to a final letter
+            if select.select([fd], [], [], 0.05)[0]:
+                data += os.read(fd, 1)
+                if data[1:] in (b'[', b'O'):
+                    while select.select([fd], [], [], 0.05)[0]:
+                        data += os.read(fd, 1)
+                        if 0x40 <= data[-1] <= 0x7e:
+                            break
+        elif data and data[0] >= 0xc0:
+            # The lead byte of a UTF-8 character gives how many bytes follow it
+            length = 2 if data[0] < 0xe0 else 3 if data[0] < 0xf0 else 4
+            data += os.read(fd, length - 1)
+        return data.decode(errors='replace')
     
     def load_data(self):
-        """Load existing data from file"""
+        """Load students from file and replay any journaled changes"""
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
+                with open(self.data_file, 'rb') as f:
+                    data = _loads(f.read())
                     self.students = data.get('students', {})
-                    self.attendance_records = data.get('attendance_records', {})
+                    legacy_records = data.get('attendance_records')
             except (json.JSONDecodeError, FileNotFoundError):
                 self.students = {}
-                self.attendance_records = {}
+                legacy_records = None
+            
+            # Split attendance from older single-file data into per-date files
+            if legacy_records:
+                for date, records in legacy_records.items():
+                    self.attendance_records.write(date, records)
+                self._write_students()
+        
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, 'rb+') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Cut off a partially written last line left by an interrupted run,
+                        # so the next event is appended on a line of its own
+                        f.truncate(f.tell() - len(line))
+                        break
+                    try:
+                        self._apply(_loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                        # Skip a line that does not hold a valid event
+                        continue
+    
+    def _apply(self, event):
+        """Apply a single journal event to the in-memory data"""
+        if event['type'] == 'student':
+            self.students[event['id']] = {
+                'name': event['name'],
+                'added_date': event['added_date']
+            }
+        elif event['type'] == 'reset':
+            self.attendance_records[event['date']] = {}
+        elif event['type'] == 'mark':
+            records = self.attendance_records.get(event['date'], {})
+            records[event['id']] = {
+                'status': event['status'],
+                'marked_time': event['marked_time']
+            }
+            self.attendance_records[event['date']] = records
+    
+    def _write_students(self):
+        """Write the student list to the data file"""
+        with open(self.data_file, 'wb') as f:
+            f.write(_dumps({'students': self.students}, indent=DEBUG))
+    
+    def _append(self, *events):
+        """Record changes in the journal with a single write instead of rewriting the whole data file"""
+        self._journal.write(b''.join(_dumps(event) + b'\n' for event in events))
+        self._journal.flush()
     
     def save_data(self):
-        """Save data to file"""
-        data = {
-            'students': self.students,
-            'attendance_records': self.attendance_records
-        }
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        """Save all data to file and clear the journal it now includes"""
+        self.attendance_records.flush()
+        self._write_students()
+        self._journal.truncate(0)
     
     def add_student(self, student_id: str, name: str):
         """Add a new student to the system"""
-        if student_id in self.students:
-            message = f"Student with ID {student_id} already exists!"
+        return self.add_students([(student_id, name)]) == 1
+    
+    def add_students(self, pairs: List[tuple]):
+        """Add several (student_id, name) pairs with a single write, returning how many were added"""
+        added = []
+        duplicates = []
+        added_date = datetime.now().strftime(self._DATETIME_FMT)
+        for student_id, name in pairs:
+            if student_id in self.students:
+                duplicates.append(student_id)
+                continue
+            
+            self.students[student_id] = {
+                'name': name,
+                'added_date': added_date
+            }
+            added.append({'type': 'student', 'id': student_id, **self.students[student_id]})
+        
+        # Announce duplicates once rather than once per skipped student
+        if len(duplicates) == 1:
+            message = f"Student with ID {duplicates[0]} already exists!"
             print(message)
             self.speak(message)
-            return False
-        
-        self.students[student_id] = {
-            'name': name,
-            'added_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-        self.save_data()
-        message = f"Student {name} with ID {student_id} added successfully!"
+        elif duplicates:
+            print(f"Students with these IDs already exist: {', '.join(duplicates)}")
+            self.speak(f"{len(duplicates)} students already exist and were skipped!")
+        
+        if not added:
+            return 0
+        self._append(*added)
+        # Reports only list registered students, so cached ones may now be incomplete
+        self._summary_cache.clear()
+        
+        if len(added) == 1:
+            message = f"Student {added[0]['name']} with ID {added[0]['id']} added successfully!"
+        else:
+            message = f"{len(added)} students added successfully!"
         print(message)
         self.speak(message)
-        return True
+        return len(added)
+    
+    def import_students_csv(self, csv_file: str):
+        """Import students from a CSV file with student ID and name columns"""
+        # utf-8-sig also accepts the byte order mark Excel writes at the start of UTF-8 CSVs
+        try:
+            with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+                rows = list(csv.reader(f))
+        except OSError as e:
+            reason = e.strerror
+        except UnicodeDecodeError:
+            reason = "it is not UTF-8 text (save it as CSV UTF-8)"
+        except csv.Error as e:
+            reason = str(e)
+        else:
+            reason = None
+        if reason is not None:
+            message = f"Could not read {csv_file}: {reason}"
+            print(message)
+            self.speak(message)
+            return 0
+        
+        pairs = []
+        for row in rows:
+            if len(row) < 2 or not row[0].strip() or not row[1].strip():
+                continue
+            student_id, name = row[0].strip(), row[1].strip()
+            # Skip an optional header row
+            if student_id.lower() in ('id', 'student id', 'student_id'):
+                continue
+            pairs.append((student_id, name))
+        
+        if not pairs:
+            message = f"No students found in {csv_file}"
+            print(message)
+            self.speak(message)
+            return 0
+        return self.add_students(pairs)
     
     def voice_attendance_call(self, date: str = None, delay: int = 3):
         """Call attendance using voice with customizable delay"""
@@ -84,7 +590,7 @@ class VoiceAttendanceSystem:
             return
         
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = datetime.now().strftime(self._DATE_FMT)
         
         if date in self.attendance_records:
             message = f"Attendance for {date} already exists!"
@@ -100,49 +606,61 @@ class VoiceAttendanceSystem:
         self.speak(start_message)
         time.sleep(2)
         
-        self.attendance_records[date] = {}
+        records = {}
+        self.attendance_records[date] = records
+        self._append({'type': 'reset', 'date': date})
+        student_ids = list(self.students)
         
-        for student_id, student_info in self.students.items():
-            student_name = student_info['name']
+        for index, student_id in enumerate(student_ids):
+            student_name = self.students[student_id]['name']
             
-            # Call student's name
+            # Call student's name, using the audio rendered during the previous student if ready
             call_message = f"Calling {student_name}"
             print(f"\n🎯 {call_message}")
-            self.speak(call_message)
+            self.speak(call_message, ("Calling", student_name))
             
-            # Wait for response
-            time.sleep(1)
+            # Render the next student's name while waiting for this response
+            if index + 1 < len(student_ids):
+                self._prerender(self.students[student_ids[index + 1]]['name'])
+            
+            # Wait for response; a keypress cuts the name off instead of waiting for it to finish
             while True:
                 print("Enter response: 'p' for Present, 'a' for Absent, 'l' for Late, 'r' to repeat name")
-                response = input(f"Response for {student_name}: ").lower().strip()
+                response = self.read_key(f"Response for {student_name}: ")
                 
-                if response == 'r':
-                    self.speak(student_name)
+                if response in self._REPEAT_KEYS:
+                    self.speak(student_name, (student_name,))
                     continue
-                elif response in ['p', 'a', 'l']:
-                    status_map = {'p': 'Present', 'a': 'Absent', 'l': 'Late'}
-                    status = status_map[response]
+                elif response in self._STATUS_MAP:
+                    status = self._STATUS_MAP[response]
                     
-                    self.attendance_records[date][student_id] = {
+                    marked_at = time.monotonic()
+                    records[student_id] = {
                         'status': status,
-                        'marked_time': datetime.now().strftime('%H:%M:%S')
+                        'marked_time': datetime.now().strftime(self._TIME_FMT)
                     }
+                    self._append({'type': 'mark', 'date': date, 'id': student_id,
+                                  **records[student_id]})
                     
                     # Confirm the status
                     confirm_message = f"{student_name} marked as {status}"
                     print(f"✓ {confirm_message}")
-                    self.speak(confirm_message)
+                    self.speak(confirm_message, (student_name, f"marked as {status}"))
                     break
                 else:
                     error_msg = "Invalid input! Please enter p, a, l, or r"
                     print(error_msg)
                     self.speak(error_msg)
             
-            # Delay before next student (except for the last one)
-            if student_id != list(self.students.keys())[-1]:
-                time.sleep(delay)
-        
-        self.save_data()
+            # Before the next student (except after the last one), wait for the confirmation to
+            # be spoken, then for whatever is left of delay; speaking time counts towards it.
+            # A stalled engine holds the call up for at most _SPEECH_TIMEOUT seconds
+            if index != len(student_ids) - 1:
+                self._wait_for_speech(self._SPEECH_TIMEOUT)
+                time.sleep(max(0, delay - (time.monotonic() - marked_at)))
+        
+        self.attendance_records.write(date)
+        self._summary_cache.pop(date, None)
         completion_message = f"Attendance call completed for {date}"
         print(f"\n✅ {completion_message}")
         self.speak(completion_message)
@@ -155,10 +673,37 @@ class VoiceAttendanceSystem:
         """Detailed attendance call with longer delays for large classes"""
         self.voice_attendance_call(date, delay=5)
     
+    def _summarize(self, date: str):
+        """Return (status counts, absent names, formatted report rows) for a date, cached until it changes"""
+        if date in self._summary_cache:
+            self._summary_cache.move_to_end(date)
+            return self._summary_cache[date]
+        
+        # Count statuses, collect absent names and build report rows in a single pass
+        counts = {'Present': 0, 'Absent': 0, 'Late': 0}
+        absent_students = []
+        rows = []
+        for sid, record in self.attendance_records[date].items():
+            status = record['status']
+            counts[status] = counts.get(status, 0) + 1
+            info = self.students.get(sid)
+            if info is None:
+                continue
+            name = info['name']
+            rows.append(f"{sid:<10} {name:<20} {status:<10} {record['marked_time']:<10}")
+            if status == 'Absent':
+                absent_students.append(name)
+        
+        summary = self._summary_cache[date] = (counts, absent_students, rows)
+        # Evict the least recently used dates past the limit, as AttendanceRecords does
+        while len(self._summary_cache) > self._SUMMARY_CACHE_SIZE:
+            self._summary_cache.popitem(last=False)
+        return summary
+    
     def announce_attendance_summary(self, date: str = None):
         """Announce attendance summary using voice"""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = datetime.now().strftime(self._DATE_FMT)
         
         if date not in self.attendance_records:
             message = f"No attendance records found for {date}"
@@ -166,25 +711,19 @@ class VoiceAttendanceSystem:
             self.speak(message)
             return
         
-        records = self.attendance_records[date]
-        present_count = sum(1 for r in records.values() if r['status'] == 'Present')
-        absent_count = sum(1 for r in records.values() if r['status'] == 'Absent')
-        late_count = sum(1 for r in records.values() if r['status'] == 'Late')
-        total_count = len(records)
+        counts, absent_students, _ = self._summarize(date)
+        total_count = len(self.attendance_records[date])
         
-        summary = f"Attendance summary for {date}. Total students: {total_count}. Present: {present_count}. Absent: {absent_count}. Late: {late_count}."
+        summary = f"Attendance summary for {date}. Total students: {total_count}. Present: {counts['Present']}. Absent: {counts['Absent']}. Late: {counts['Late']}."
         
         print(f"\n📊 {summary}")
         self.speak(summary)
         
         # Announce absent students if any
-        if absent_count > 0:
-            absent_students = [self.students[sid]['name'] for sid, record in records.items() 
-                             if record['status'] == 'Absent' and sid in self.students]
-            if absent_students:
-                absent_message = f"Absent students are: {', '.join(absent_students)}"
-                print(f"❌ {absent_message}")
-                self.speak(absent_message)
+        if absent_students:
+            absent_message = f"Absent students are: {', '.join(absent_students)}"
+            print(f"❌ {absent_message}")
+            self.speak(absent_message)
     
     def call_individual_student(self, student_id: str):
         """Call a specific student's name"""
@@ -208,6 +747,11 @@ class VoiceAttendanceSystem:
     def change_voice_settings(self):
         """Change voice speed and volume settings"""
         print("\n--- Voice Settings ---")
+        try:
+            self.tts_engine
+        except Exception as e:
+            print(f"Voice settings are unavailable: {e}")
+            return
         current_rate = self.tts_engine.getProperty('rate')
         current_volume = self.tts_engine.getProperty('volume')
         
@@ -220,6 +764,7 @@ class VoiceAttendanceSystem:
                 rate = int(new_rate)
                 if 50 <= rate <= 300:
                     self.tts_engine.setProperty('rate', rate)
+                    self._wav_cache.clear()
                     self.speak(f"Speech rate changed to {rate}")
                 else:
                     print("Rate must be between 50 and 300")
@@ -229,6 +774,7 @@ class VoiceAttendanceSystem:
                 volume = float(new_volume)
                 if 0.0 <= volume <= 1.0:
                     self.tts_engine.setProperty('volume', volume)
+                    self._wav_cache.clear()
                     self.speak(f"Volume changed to {volume}")
                 else:
                     print("Volume must be between 0.0 and 1.0")
@@ -239,22 +785,21 @@ class VoiceAttendanceSystem:
     def view_attendance(self, date: str = None):
         """View attendance for a specific date"""
         if date is None:
-            date = datetime.now().strftime('%Y-%m-%d')
+            date = datetime.now().strftime(self._DATE_FMT)
         
         if date not in self.attendance_records:
             print(f"No attendance records found for {date}")
             return
         
-        print(f"\n--- Attendance Report for {date} ---")
-        print(f"{'ID':<10} {'Name':<20} {'Status':<10} {'Time':<10}")
-        print("-" * 50)
-        
-        for student_id, record in self.attendance_records[date].items():
-            if student_id in self.students:
-                name = self.students[student_id]['name']
-                status = record['status']
-                time = record['marked_time']
-                print(f"{student_id:<10} {name:<20} {status:<10} {time:<10}")
+        _, _, rows = self._summarize(date)
+        # Emit the whole report with one write rather than one print per row
+        lines = [
+            f"\n--- Attendance Report for {date} ---",
+            f"{'ID':<10} {'Name':<20} {'Status':<10} {'Time':<10}",
+            "-" * 50,
+            *rows
+        ]
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def list_students(self):
         """List all registered students"""
@@ -262,12 +807,72 @@ class VoiceAttendanceSystem:
             print("No students registered!")
             return
         
-        print("\n--- Registered Students ---")
-        print(f"{'ID':<10} {'Name':<20} {'Added Date':<20}")
-        print("-" * 50)
-        
-        for student_id, info in self.students.items():
-            print(f"{student_id:<10} {info['name']:<20} {info['added_date']:<20}")
+        # Emit the whole list with one write rather than one print per row
+        lines = [
+            "\n--- Registered Students ---",
+            f"{'ID':<10} {'Name':<20} {'Added Date':<20}",
+            "-" * 50
+        ]
+        lines.extend(f"{student_id:<10} {info['name']:<20} {info['added_date']:<20}"
+                     for student_id, info in self.students.items())
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+_MENU = "\n".join([
+    "",
+    "=" * 60,
+    "         🎤 VOICE ATTENDANCE CALLING SYSTEM 🎤",
+    "=" * 60,
+    "1. Add Student",
+    "2. Voice Attendance Call (Normal)",
+    "3. Quick Attendance Call",
+    "4. Detailed Attendance Call",
+    "5. Call Individual Student",
+    "6. Announce Attendance Summary",
+    "7. View Attendance Report",
+    "8. List All Students",
+    "9. Test Voice System",
+    "10. Change Voice Settings",
+    "11. Exit",
+    "12. Import Students from CSV",
+    "-" * 60,
+    ""
+])
+
+# Returned by _read_date() when the user typed a malformed date
+_INVALID_DATE = object()
+# Returned by a menu handler to leave the main loop
+_QUIT = object()
+
+
+@lru_cache(maxsize=256)
+def _valid_date(date_input: str) -> bool:
+    """Check a YYYY-MM-DD date, remembering answers since strptime is slow"""
+    try:
+        datetime.strptime(date_input, VoiceAttendanceSystem._DATE_FMT)
+        return True
+    except ValueError:
+        return False
+
+
+def _read_date():
+    """Prompt for an optional date; None means today"""
+    date_input = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
+    if not date_input:
+        return None
+    if not _valid_date(date_input):
+        print("Invalid date format! Use YYYY-MM-DD")
+        return _INVALID_DATE
+    return date_input
+
+
+def _with_date(action):
+    """Build a menu handler that asks for a date and calls action with it if valid"""
+    def handler():
+        date = _read_date()
+        if date is not _INVALID_DATE:
+            action(date)
+    return handler
+
 
 def main():
     print("Initializing Voice Attendance System...")
@@ -276,113 +881,59 @@ def main():
     # Test voice on startup
     system.speak("Voice Attendance System initialized successfully")
     
+    def add_student():
+        student_id = input("Enter Student ID: ").strip()
+        name = input("Enter Student Name: ").strip()
+        if student_id and name:
+            system.add_student(student_id, name)
+        else:
+            print("Please provide both ID and name!")
+    
+    def call_individual_student():
+        student_id = input("Enter Student ID to call: ").strip()
+        if student_id:
+            system.call_individual_student(student_id)
+        else:
+            print("Please provide Student ID!")
+    
+    def import_students():
+        csv_file = input("Enter CSV file path (ID,Name per line): ").strip()
+        if csv_file:
+            system.import_students_csv(csv_file)
+        else:
+            print("Please provide a file path!")
+    
+    def exit_system():
+        system.save_data()
+        farewell_message = "Thank you for using the Voice Attendance System! Goodbye!"
+        print(farewell_message)
+        system.speak_sync(farewell_message)
+        system.shutdown()
+        return _QUIT
+    
+    def invalid_choice():
+        print("Invalid choice! Please enter a number between 1-12.")
+    
+    handlers = {
+        '1': add_student,
+        '2': _with_date(system.voice_attendance_call),
+        '3': _with_date(system.quick_attendance_call),
+        '4': _with_date(system.detailed_attendance_call),
+        '5': call_individual_student,
+        '6': _with_date(system.announce_attendance_summary),
+        '7': _with_date(system.view_attendance),
+        '8': system.list_students,
+        '9': system.test_voice,
+        '10': system.change_voice_settings,
+        '11': exit_system,
+        '12': import_students,
+    }
+    
     while True:
-        print("\n" + "="*60)
-        print("         🎤 VOICE ATTENDANCE CALLING SYSTEM 🎤")
-        print("="*60)
-        print("1. Add Student")
-        print("2. Voice Attendance Call (Normal)")
-        print("3. Quick Attendance Call")
-        print("4. Detailed Attendance Call")
-        print("5. Call Individual Student")
-        print("6. Announce Attendance Summary")
-        print("7. View Attendance Report")
-        print("8. List All Students")
-        print("9. Test Voice System")
-        print("10. Change Voice Settings")
-        print("11. Exit")
-        print("-"*60)
-        
-        choice = input("Enter your choice (1-11): ").strip()
-        
-        if choice == '1':
-            student_id = input("Enter Student ID: ").strip()
-            name = input("Enter Student Name: ").strip()
-            if student_id and name:
-                system.add_student(student_id, name)
-            else:
-                print("Please provide both ID and name!")
-        
-        elif choice == '2':
-            date_input = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
-            if date_input:
-                try:
-                    datetime.strptime(date_input, '%Y-%m-%d')
-                    system.voice_attendance_call(date_input)
-                except ValueError:
-                    print("Invalid date format! Use YYYY-MM-DD")
-            else:
-                system.voice_attendance_call()
-        
-        elif choice == '3':
-            date_input = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
-            if date_input:
-                try:
-                    datetime.strptime(date_input, '%Y-%m-%d')
-                    system.quick_attendance_call(date_input)
-                except ValueError:
-                    print("Invalid date format! Use YYYY-MM-DD")
-            else:
-                system.quick_attendance_call()
-        
-        elif choice == '4':
-            date_input = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
-            if date_input:
-                try:
-                    datetime.strptime(date_input, '%Y-%m-%d')
-                    system.detailed_attendance_call(date_input)
-                except ValueError:
-                    print("Invalid date format! Use YYYY-MM-DD")
-            else:
-                system.detailed_attendance_call()
-        
-        elif choice == '5':
-            student_id = input("Enter Student ID to call: ").strip()
-            if student_id:
-                system.call_individual_student(student_id)
-            else:
-                print("Please provide Student ID!")
-        
-        elif choice == '6':
-            date_input = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
-            if date_input:
-                try:
-                    datetime.strptime(date_input, '%Y-%m-%d')
-                    system.announce_attendance_summary(date_input)
-                except ValueError:
-                    print("Invalid date format! Use YYYY-MM-DD")
-            else:
-                system.announce_attendance_summary()
-        
-        elif choice == '7':
-            date = input("Enter date (YYYY-MM-DD) or press Enter for today: ").strip()
-            if not date:
-                date = None
-            elif date:
-                try:
-                    datetime.strptime(date, '%Y-%m-%d')
-                except ValueError:
-                    print("Invalid date format! Use YYYY-MM-DD")
-                    continue
-            system.view_attendance(date)
-        
-        elif choice == '8':
-            system.list_students()
-        
-        elif choice == '9':
-            system.test_voice()
-        
-        elif choice == '10':
-            system.change_voice_settings()
-        
-        elif choice == '11':
-            farewell_message = "Thank you for using the Voice Attendance System! Goodbye!"
-            print(farewell_message)
-            system.speak(farewell_message)
+        sys.stdout.write(_MENU)
+        choice = input("Enter your choice (1-12): ").strip()
+        if handlers.get(choice, invalid_choice)() is _QUIT:
             break
-        
-        else:
-            print("Invalid choice! Please enter a number between 1-11.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file